@@ -38,7 +38,10 @@ class AlertOrchestrator:
 		self.ai = AIInsightsEngine()
 		self.llm = LLMClient()
 		self.request_service = ExternalService()
-		
+
+	async def close(self) -> None:
+		"""Close the pooled HTTP sessions opened on the running loop"""
+		await asyncio.gather(self.request_service.close(), self.ai.close())
 
 	async def process_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
 		"""
@@ -9,7 +9,7 @@ from datetime import datetime, UTC
 from enum import Enum
 
 from services.social_data_fetcher import SocialDataFetcher
-from services.sentiment_analyzer import SentimentAnalyzer
+from services.sentiment_analyzer import SentimentAnalyzer, default_analyzer
 
 logger = logging.getLogger(__name__)
 
@@ -35,16 +35,17 @@ class SocialAgent:
     - Narrative detection
     """
     
-    def __init__(self, use_mock: bool = False):
+    def __init__(self, use_mock: bool = False, sentiment_analyzer: Optional[SentimentAnalyzer] = None):
         """
         Initialize Social Agent
         
         Args:
             use_mock: Use mock data (False = use real APIs)
+            sentiment_analyzer: Analyzer to use (default: the shared instance)
         """
         self.use_mock = use_mock
         self.data_fetcher = SocialDataFetcher()
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_analyzer = sentiment_analyzer or default_analyzer
         
         # Narrative Keywords
         self.narrative_keywords = [
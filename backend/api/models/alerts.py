@@ -2,7 +2,7 @@
 Alert Models for Fluxo
 Defines alert types, triggers, and delivery formats
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
@@ -76,7 +76,7 @@ class Alert(BaseModel):
     An alert generated by the system
     """
     alert_id: str
-    alert_type: AlertType
+    alert_type: AlertType = Field(serialization_alias="type")
     severity: AlertSeverity
     title: str
     message: str
@@ -96,20 +96,19 @@ class Alert(BaseModel):
     delivery_method: Optional[str] = None  # "x402", "telegram", "webhook"
     
     def to_dict(self):
-        return {
-            "alert_id": self.alert_id,
-            "type": self.alert_type.value,
-            "severity": self.severity.value,
-            "title": self.title,
-            "message": self.message,
-            "wallet_address": self.wallet_address,
-            "current_value": self.current_value,
-            "threshold": self.threshold,
-            "details": self.details,
-            "timestamp": self.timestamp.isoformat(),
-            "triggered_by": self.triggered_by,
-            "delivered": self.delivered
-        }
+        return self.model_dump(mode="json", by_alias=True, exclude=_TO_DICT_EXCLUDE)
+    
+    @staticmethod
+    def to_dicts(alerts: List["Alert"]) -> List[Dict[str, Any]]:
+        """to_dict for a list of alerts, serialized in one pydantic-core call"""
+        return _ALERT_LIST.dump_python(
+            alerts, mode="json", by_alias=True, exclude={"__all__": _TO_DICT_EXCLUDE}
+        )
+
+
+# Delivery details are internal and left out of the API/task payloads
+_TO_DICT_EXCLUDE = {"delivery_method"}
+_ALERT_LIST = TypeAdapter(List[Alert])
 
 
 class AlertRule(BaseModel):
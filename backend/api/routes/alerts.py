@@ -43,7 +43,7 @@ async def get_alerts(
             success=True,
             message=f"Retrieved {len(alerts)} alerts",
             data={
-                "alerts": [alert.to_dict() for alert in alerts],
+                "alerts": Alert.to_dicts(alerts),
                 "total": len(alerts),
                 "wallet_address": wallet_address
             }
@@ -67,7 +67,7 @@ async def get_undelivered_alerts():
             success=True,
             message=f"Retrieved {len(alerts)} undelivered alerts",
             data={
-                "alerts": [alert.to_dict() for alert in alerts],
+                "alerts": Alert.to_dicts(alerts),
                 "total": len(alerts)
             }
         )
@@ -11,7 +11,7 @@ from tasks.agent_tasks import portfolio_task
 from celery.result import AsyncResult
 from core import celery_app
 from api.models.schemas import APIResponse, PortfolioInput
-from services.ai_insights_engine import AIInsightsEngine
+from services.ai_insights_engine import get_ai_engine
 from agents.risk_agent import RiskAgent
 from agents.social_agent import SocialAgent
 
@@ -65,7 +65,7 @@ async def generate_portfolio_insights(
         
         # Initialize agents
         risk_agent = RiskAgent()
-        ai_engine = AIInsightsEngine()
+        ai_engine = get_ai_engine()
         
         # Get risk analysis
         risk_analysis = risk_agent.analyze_portfolio({
@@ -110,7 +110,7 @@ async def quick_portfolio_insights(
     """
     try:
         risk_agent = RiskAgent()
-        ai_engine = AIInsightsEngine()
+        ai_engine = get_ai_engine()
         
         risk_analysis = risk_agent.analyze_portfolio({
             "wallet": wallet_address,
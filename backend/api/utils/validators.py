@@ -1,13 +1,22 @@
+import re
+
+# 0x (either case) followed by exactly 40 hex digits
+_ADDRESS_MATCH = re.compile(r'0[xX][0-9a-fA-F]{40}\Z').match
+
+
 def validate_wallet_address(address: str) -> str:
     if not address or not isinstance(address, str):
         raise ValueError("Wallet address is required")
     
-    address = address.strip().lower()
+    address = address.strip()
     
-    if not address.startswith('0x'):
+    if _ADDRESS_MATCH(address):
+        return address.lower()
+    
+    if address[:2].lower() != '0x':
         raise ValueError("Address must start with 0x")
     
     if len(address) != 42:
         raise ValueError("Address must be 42 characters long")
     
-    return address
+    raise ValueError("Address must contain only hexadecimal characters")
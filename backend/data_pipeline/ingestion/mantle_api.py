@@ -1,16 +1,39 @@
+import asyncio
 import logging
-from typing import List,Optional,AsyncIterator
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import List,Optional,AsyncIterator,Tuple
 from pydantic import BaseModel
 
 from web3 import Web3,AsyncHTTPProvider,AsyncWeb3,WebSocketProvider
+from web3.contract import AsyncContract
 from eth_utils import to_checksum_address
-from eth_abi import decode
-from eth_abi.exceptions import InsufficientDataBytes
 
 from core.config import MANTLE_RPC_URL,MANTLE_WSS_URL
 
 logger = logging.getLogger(__name__)
 
+# keccak("Transfer(address,address,uint256)") computed once at import
+TRANSFER_TOPIC = bytes(Web3.keccak(text="Transfer(address,address,uint256)"))
+
+# ERC20 Token ABI (only the balanceOf and decimals functions)
+ERC20_ABI = (
+    {"constant": True, "inputs": [{"name": "_owner", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "balance", "type": "uint256"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "type": "function"},
+)
+
+# Upper bound on cached token contract objects
+MAX_CACHED_CONTRACTS = 4096
+
+# Calls per JSON-RPC batch, RPC nodes commonly reject larger batches
+MAX_BATCH_SIZE = 100
+
+# EIP-55 checksumming hashes the address, popular tokens and wallets recur constantly
+@lru_cache(maxsize=131072)
+def _checksum(address: bytes | str) -> str:
+    return to_checksum_address(address)
+
 class TranferReponse(BaseModel):
     token: str
     from_address: str
@@ -19,20 +42,38 @@ class TranferReponse(BaseModel):
     transaction_hash: str
     block_number: int
 
+# Lightweight transfer record used on the streaming path, values are already typed
+@dataclass(slots=True)
+class TransferEvent:
+    token: str
+    from_address: str
+    to_address: str
+    amount: int
+    transaction_hash: str
+    block_number: int
+
+    def to_pydantic(self) -> TranferReponse:
+        """Convert to the pydantic response model at the API boundary"""
+        return TranferReponse.model_construct(**asdict(self))
+
 class MantleAPI:
     def __init__(self):
-        transfer_event_signature = "Transfer(address,address,uint256)"
-        self.tranfer_topic = [ AsyncWeb3.keccak(text=transfer_event_signature)]
+        self.tranfer_topic = [TRANSFER_TOPIC]
         self.subscription_id : Optional[str] = None
         self.w3 = None
         self.web3 = AsyncWeb3(AsyncHTTPProvider(MANTLE_RPC_URL))
+        # decimals() never changes for a token, so it is fetched once per address
+        # and kept with the same cap and LRU eviction as the contract cache
+        self._decimals_cache: OrderedDict[str, int] = OrderedDict()
+        # Contract objects per token address, least recently used evicted first
+        self._contracts: OrderedDict[str, AsyncContract] = OrderedDict()
 
     # Fetch MNT user balance
     async def get_balance(self, address: str) -> float:
         """Fetch the balance of an address on the Mantle network."""
         checksum_address = to_checksum_address(address)
         balance_wei = await self.web3.eth.get_balance(checksum_address)
-        balance_eth = self.web3.fromWei(balance_wei, 'ether')
+        balance_eth = self.web3.from_wei(balance_wei, 'ether')
         return balance_eth
     
     # fetch user token balance
@@ -43,28 +84,119 @@ class MantleAPI:
         checksum_token_address = to_checksum_address(token_address)
         checksum_wallet_address = to_checksum_address(wallet_address)
         
-        # ERC20 Token ABI (only the balanceOf function)
-        erc20_abi = [
-            {"constant": True, "inputs": [{"name": "_owner", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "balance", "type": "uint256"}], "type": "function"},
-            {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "type": "function"},
-        ]
-        
-        token_contract = self.web3.eth.contract(address=checksum_token_address, abi=erc20_abi)
-        balance = await token_contract.functions.balanceOf(checksum_wallet_address).call()
-        decimals = await token_contract.functions.decimals().call()
+        token_contract = self._get_token_contract(checksum_token_address)
+        decimals = self._get_cached_decimals(checksum_token_address)
+        if decimals is None:
+            # Both eth_calls travel in one JSON-RPC batch request
+            async with self.web3.batch_requests() as batch:
+                batch.add(token_contract.functions.balanceOf(checksum_wallet_address))
+                batch.add(token_contract.functions.decimals())
+                balance, decimals = await batch.async_execute()
+            self._cache_decimals(checksum_token_address, decimals)
+        else:
+            balance = await token_contract.functions.balanceOf(checksum_wallet_address).call()
         adjusted_balance = balance / (10 ** decimals)
         return adjusted_balance
 
 
+    # Cached ERC20 contract object for a checksummed token address
+    def _get_token_contract(self, checksum_token_address: str) -> AsyncContract:
+        token_contract = self._contracts.get(checksum_token_address)
+        if token_contract is not None:
+            self._contracts.move_to_end(checksum_token_address)
+            return token_contract
+
+        token_contract = self.web3.eth.contract(address=checksum_token_address, abi=ERC20_ABI)
+        self._contracts[checksum_token_address] = token_contract
+        if len(self._contracts) > MAX_CACHED_CONTRACTS:
+            self._contracts.popitem(last=False)
+        return token_contract
+
+    def _get_cached_decimals(self, checksum_token_address: str) -> Optional[int]:
+        decimals = self._decimals_cache.get(checksum_token_address)
+        if decimals is not None:
+            self._decimals_cache.move_to_end(checksum_token_address)
+        return decimals
+
+    def _cache_decimals(self, checksum_token_address: str, decimals: int) -> None:
+        self._decimals_cache[checksum_token_address] = decimals
+        if len(self._decimals_cache) > MAX_CACHED_CONTRACTS:
+            self._decimals_cache.popitem(last=False)
+
+    # fetch MNT balances for many addresses
+    async def get_balances(self, addresses: List[str], max_concurrency: int = 4) -> List[float]:
+        """
+        Fetch MNT balances for several addresses, in input order.
+        Calls are sent as JSON-RPC batches of up to MAX_BATCH_SIZE requests.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(chunk: List[str]) -> List[float]:
+            async with semaphore:
+                async with self.web3.batch_requests() as batch:
+                    for address in chunk:
+                        batch.add(self.web3.eth.get_balance(to_checksum_address(address)))
+                    balances_wei = await batch.async_execute()
+            return [self.web3.from_wei(balance_wei, 'ether') for balance_wei in balances_wei]
+
+        chunks = [addresses[i:i + MAX_BATCH_SIZE] for i in range(0, len(addresses), MAX_BATCH_SIZE)]
+        results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return [balance for chunk_balances in results for balance in chunk_balances]
+
+    # fetch token balances for many (token, wallet) pairs
+    async def get_token_balances(self, pairs: List[Tuple[str, str]], max_concurrency: int = 4) -> List[float]:
+        """
+        Fetch ERC20 balances for several (token_address, wallet_address) pairs,
+        in input order. balanceOf calls, plus decimals for tokens not seen
+        before, are sent as JSON-RPC batches of up to MAX_BATCH_SIZE requests.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(chunk: List[Tuple[str, str]]) -> List[float]:
+            checksum_pairs = [
+                (to_checksum_address(token), to_checksum_address(wallet))
+                for token, wallet in chunk
+            ]
+            # Held locally so other chunks evicting entries mid-batch can't drop them
+            decimals_by_token = {
+                token: self._get_cached_decimals(token)
+                for token in dict.fromkeys(token for token, _ in checksum_pairs)
+            }
+            missing_decimals = [token for token, decimals in decimals_by_token.items() if decimals is None]
+
+            async with semaphore:
+                async with self.web3.batch_requests() as batch:
+                    for token, wallet in checksum_pairs:
+                        batch.add(self._get_token_contract(token).functions.balanceOf(wallet))
+                    for token in missing_decimals:
+                        batch.add(self._get_token_contract(token).functions.decimals())
+                    responses = await batch.async_execute()
+
+            balances = responses[:len(checksum_pairs)]
+            for token, decimals in zip(missing_decimals, responses[len(checksum_pairs):]):
+                decimals_by_token[token] = decimals
+                self._cache_decimals(token, decimals)
+
+            return [
+                balance / (10 ** decimals_by_token[token])
+                for (token, _), balance in zip(checksum_pairs, balances)
+            ]
+
+        chunk_size = MAX_BATCH_SIZE // 2
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return [balance for chunk_balances in results for balance in chunk_balances]
+
+
     # Listen to tokens Transfer Events
-    async def tranfers_event(self) -> AsyncIterator[dict]:
+    async def tranfers_event(self) -> AsyncIterator[TransferEvent]:
         """"
         This function get all the token transfer happening in mantle Network
         
         return:
-            AsyncIterato[dict]
-            TranferReponse(
-                token=to_checksum_address(log.get("address")),
+            AsyncIterator[TransferEvent]
+            TransferEvent(
+                token=_checksum(log.get("address")),
                 from_address=from_address,
                 to_address=to_address,
                 amount=amount,
@@ -91,39 +223,46 @@ class MantleAPI:
                     continue
                 
                 # Determine event type from topic0
-                topic0 = log.get("topics", [])[0] if log.get("topics") else None
-                if not topic0:
+                topics = log.get("topics")
+                if not topics:
                     continue
 
-                if topic0 != self.tranfer_topic[0]:
+                topic0 = bytes(topics[0])
+                if topic0 != TRANSFER_TOPIC:
                     continue
 
-                transfer_event = await self._parse_transfer_event(log)
+                transfer_event = self._parse_transfer_event(log)
                 if not transfer_event:
                     continue
                 yield transfer_event
 
     # Pasrse Transfer Event Log
-    async def _parse_transfer_event(self,log:dict)->TranferReponse|None:
-        try:
-            topics = log.get("topics", [])
-            data = log.get("data", "0x")
-
-            from_address = to_checksum_address("0x" + topics[1].hex()[24:])
-            to_address = to_checksum_address("0x" + topics[2].hex()[24:])
-            
-            if isinstance(data, str):
-                data =  bytes.fromhex(data[2:] if data.startswith('0x') else data)
-        
-            amount = decode(['uint256'], data)[0]
-            return TranferReponse(
-                token=to_checksum_address(log.get("address")),
-                from_address=from_address,
-                to_address=to_address,
-                amount=amount,
-                transaction_hash= "0x" + log.get("transactionHash").hex(),
-                block_number=log.get("blockNumber")
-            )
-        except InsufficientDataBytes as e:
-            logger.error(f"Error decoding event data: {e}")
-            return None
\ No newline at end of file
+    def _parse_transfer_event(self,log:dict)->TransferEvent|None:
+        topics = log.get("topics", [])
+        if len(topics) < 3:
+            return None
+
+        # Indexed addresses are left-padded to 32 bytes, keep the last 20
+        from_address = _checksum(bytes(topics[1])[-20:])
+        to_address = _checksum(bytes(topics[2])[-20:])
+
+        raw = log.get("data", "0x")
+        if isinstance(raw, (bytes, bytearray)):
+            data = raw
+        else:
+            data = bytes.fromhex(raw[2:] if raw.startswith('0x') else raw)
+
+        # ERC721 transfers share the signature but carry no amount in data
+        if len(data) < 32:
+            logger.error(f"Error decoding event data: expected 32 bytes, got {len(data)}")
+            return None
+
+        amount = int.from_bytes(data[-32:], 'big')
+        return TransferEvent(
+            token=_checksum(log.get("address")),
+            from_address=from_address,
+            to_address=to_address,
+            amount=amount,
+            transaction_hash= "0x" + log.get("transactionHash").hex(),
+            block_number=log.get("blockNumber")
+        )
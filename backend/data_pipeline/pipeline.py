@@ -2,14 +2,13 @@ import asyncio
 import json
 import logging
 from typing import AsyncIterator
-from pydantic import BaseModel
 
 from core.pubsub.channel_manager import ChannelNames
 from models.redis_connect import db_connector
 
 from .ingestion.defi_llama import Defillama
 from .ingestion.dune_service import DuneService
-from .ingestion.mantle_api import MantleAPI
+from .ingestion.mantle_api import MantleAPI,TransferEvent
 
 from .transformation.transform_defillam_data import transform_protocol_data,transform_yield_protocol
 from .transformation.transform_dune_data import transform_user_portfolio
@@ -19,14 +18,6 @@ from .load.store import StoreData
 
 logger = logging.getLogger(__name__)
 
-class TranferReponse(BaseModel):
-    token: str
-    from_address: str
-    to_address: str
-    amount: int
-    transaction_hash: str
-    block_number: int
-
 class Pipeline:
     def __init__(self):
         self.defillama = Defillama()
@@ -95,7 +86,7 @@ class Pipeline:
                 continue
 
     
-    async def _token_watch_updater(self,transfer_data:TranferReponse)->None:
+    async def _token_watch_updater(self,transfer_data:TransferEvent)->None:
         if not transfer_data:
             return 
         
@@ -2,10 +2,15 @@ from typing import List
 from ..schemas.data_schemas import TokenBalance
 
 
-def transform_balance(balance_data:float)->float|None:
-    if not balance_data:
+def transform_balance(balance_data:float|None)->TokenBalance|None:
+    # A zero balance is a valid result, only a missing one is dropped
+    if balance_data is None:
         return None
     
     return TokenBalance(
         balance=balance_data
-    )
\ No newline at end of file
+    )
+
+
+def transform_balances(balances_data:List[float|None])->List[TokenBalance]:
+    return [TokenBalance(balance=balance) for balance in balances_data if balance is not None]
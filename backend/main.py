@@ -10,6 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from api.routes.onchain import user_subscribed_tokens_update
+from services.ai_insights_engine import get_ai_engine
 
 # Import Routes
 from api import (
@@ -48,6 +49,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     listener_task.cancel()
     print("🛑 Stopped Redis listener")
+    await get_ai_engine().close()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -9,10 +9,14 @@ This script is intentionally simple and blocking; it demonstrates how you might
 """
 from __future__ import annotations
 import os
+import sys
 from pprint import pprint
 
-from fluxo.backend.services.flipside_api import run_sql_and_get_results, FlipsideError
-from fluxo.backend.services.llm_providers import LLMClient, LLMError
+# Backend modules import each other from the backend root (utils, services, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.flipside_api import run_sql_and_get_results, FlipsideError
+from services.llm_providers import LLMClient, LLMError
 
 SAMPLE_SQL = """
 SELECT block_timestamp, event_name, tx_hash
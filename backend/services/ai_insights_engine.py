@@ -3,13 +3,86 @@ AI Insights Engine
 Uses Claude API to generate intelligent portfolio insights
 """
 import os
-import json
+import asyncio
 import aiohttp
-from typing import Dict, List, Optional
+import orjson
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from utils.http_retry import request_with_retry
+from utils.session_pool import SessionPool
+
 logger = logging.getLogger(__name__)
 
+# Cap on in-flight Claude requests per event loop
+CLAUDE_MAX_CONCURRENCY = 16
+
+# Streamed replies can run long, so bound connect and per-read gaps as well as the total
+CLAUDE_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_connect=10, sock_read=15)
+
+# Static prompt sections shared by every portfolio context
+CONTEXT_PREAMBLE = """You are Fluxo, an AI-powered DeFi portfolio analyst. Analyze this portfolio and provide actionable insights.
+
+"""
+
+CONTEXT_INSTRUCTIONS = """
+
+Please provide:
+1. Portfolio Health Summary (2-3 sentences)
+2. Key Risks (top 3, bullet points)
+3. Opportunities (top 2-3, bullet points)
+4. Actionable Recommendations (3-4 specific actions)
+5. Market Context (if social/macro data available)
+
+Format as JSON with keys: summary, risks, opportunities, recommendations, market_context
+Keep it concise, actionable, and investor-friendly.
+"""
+
+# Rule-based insights returned whenever Claude is unavailable.
+# Shared by every fallback response, so treat them as read-only.
+FALLBACK_INSIGHTS = {
+    "summary": "Portfolio analysis completed using risk metrics and market data. Review detailed breakdown below.",
+    "risks": [
+        "Monitor portfolio concentration levels",
+        "Track liquidity conditions in DeFi protocols",
+        "Stay aware of market volatility"
+    ],
+    "opportunities": [
+        "Consider diversification across L2 ecosystems",
+        "Explore yield optimization strategies"
+    ],
+    "recommendations": [
+        "Review top holdings allocation",
+        "Monitor social sentiment for tokens held",
+        "Set up automated risk alerts",
+        "Rebalance if concentration exceeds 40%"
+    ],
+    "market_context": "Analysis based on available on-chain and social data"
+}
+
+FALLBACK_DATA_SOURCES = {
+    "risk_analysis": True,
+    "social_sentiment": False,
+    "macro_conditions": False
+}
+
+# Forced tool call so Claude returns the insights as structured JSON
+INSIGHTS_TOOL = {
+    "name": "emit_insights",
+    "description": "Return the portfolio insights in structured form",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "summary": {"type": "string"},
+            "risks": {"type": "array", "items": {"type": "string"}},
+            "opportunities": {"type": "array", "items": {"type": "string"}},
+            "recommendations": {"type": "array", "items": {"type": "string"}},
+            "market_context": {"type": "string"}
+        },
+        "required": ["summary", "risks", "opportunities", "recommendations", "market_context"]
+    }
+}
+
 
 class AIInsightsEngine:
     """Generate AI-powered portfolio insights using Claude"""
@@ -18,6 +91,11 @@ class AIInsightsEngine:
         self.api_key = os.getenv("ANTHROPIC_API_KEY", "")
         self.model = "claude-sonnet-4-20250514"
         self.api_url = "https://api.anthropic.com/v1/messages"
+        self._pool = SessionPool(CLAUDE_MAX_CONCURRENCY)
+    
+    async def close(self):
+        """Close the running loop's pooled HTTP session"""
+        await self._pool.close()
     
     async def generate_portfolio_insights(
         self,
@@ -48,7 +126,7 @@ class AIInsightsEngine:
             )
             
             # Generate insights using Claude
-            insights = await self._call_claude(context)
+            insights = await self._call_claude(context, tool=INSIGHTS_TOOL)
             
             return {
                 "wallet_address": wallet_address,
@@ -64,6 +142,30 @@ class AIInsightsEngine:
             logger.error(f"AI insights generation failed: {str(e)}")
             return self._get_fallback_insights(wallet_address, risk_analysis)
     
+    async def generate_multiple_portfolio_insights(
+        self,
+        portfolios: List[Dict],
+        max_concurrency: int = 8
+    ) -> List[Dict]:
+        """
+        Generate insights for several portfolios concurrently
+        
+        Args:
+            portfolios: List of dicts with the generate_portfolio_insights
+                keyword arguments (wallet_address, risk_analysis, ...)
+            max_concurrency: Maximum in-flight Claude requests
+            
+        Returns:
+            Insights for each portfolio, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def generate(portfolio: Dict) -> Dict:
+            async with semaphore:
+                return await self.generate_portfolio_insights(**portfolio)
+        
+        return await asyncio.gather(*(generate(portfolio) for portfolio in portfolios))
+    
     def _build_context(
         self,
         wallet_address: str,
@@ -73,9 +175,9 @@ class AIInsightsEngine:
     ) -> str:
         """Build context prompt for Claude"""
         
-        context = f"""You are Fluxo, an AI-powered DeFi portfolio analyst. Analyze this portfolio and provide actionable insights.
-
-WALLET: {wallet_address}
+        parts = [
+            CONTEXT_PREAMBLE,
+            f"""WALLET: {wallet_address}
 
 RISK ANALYSIS:
 - Risk Score: {risk_analysis.get('risk_score', 'N/A')}/10
@@ -83,49 +185,39 @@ RISK ANALYSIS:
 - Concentration Risk: {risk_analysis.get('concentration_risk', 'N/A')}
 - Liquidity Score: {risk_analysis.get('liquidity_score', 'N/A')}
 """
+        ]
         
         if risk_analysis.get('top_holdings'):
-            context += "\nTop Holdings:\n"
+            parts.append("\nTop Holdings:\n")
             for holding in risk_analysis['top_holdings'][:3]:
-                context += f"  - {holding.get('token', 'Unknown')}: {holding.get('percentage', 0):.1f}% (${holding.get('value_usd', 0):,.0f})\n"
+                parts.append(f"  - {holding.get('token', 'Unknown')}: {holding.get('percentage', 0):.1f}% (${holding.get('value_usd', 0):,.0f})\n")
         
         if social_sentiment:
-            context += f"""
+            parts.append(f"""
 SOCIAL SENTIMENT:
 - Overall Sentiment: {social_sentiment.get('overall_sentiment', 'N/A')}
 - Sentiment Score: {social_sentiment.get('overall_score', 0):.2f}
 - Posts Analyzed: {social_sentiment.get('total_posts_analyzed', 0)}
-"""
+""")
             
             if social_sentiment.get('by_platform'):
-                context += "\nPlatform Breakdown:\n"
+                parts.append("\nPlatform Breakdown:\n")
                 for platform, data in social_sentiment['by_platform'].items():
-                    context += f"  - {platform.capitalize()}: {data.get('overall_sentiment', 'N/A')} ({data.get('total_posts', 0)} posts)\n"
+                    parts.append(f"  - {platform.capitalize()}: {data.get('overall_sentiment', 'N/A')} ({data.get('total_posts', 0)} posts)\n")
         
         if macro_conditions:
-            context += f"""
+            parts.append(f"""
 MACRO CONDITIONS:
 - Market Condition: {macro_conditions.get('market_condition', 'N/A')}
 - Correlation Score: {macro_conditions.get('correlation_score', 'N/A')}
-"""
+""")
         
-        context += """
-
-Please provide:
-1. Portfolio Health Summary (2-3 sentences)
-2. Key Risks (top 3, bullet points)
-3. Opportunities (top 2-3, bullet points)
-4. Actionable Recommendations (3-4 specific actions)
-5. Market Context (if social/macro data available)
-
-Format as JSON with keys: summary, risks, opportunities, recommendations, market_context
-Keep it concise, actionable, and investor-friendly.
-"""
+        parts.append(CONTEXT_INSTRUCTIONS)
         
-        return context
+        return "".join(parts)
     
-    async def _call_claude(self, context: str) -> Dict:
-        """Call Claude API"""
+    async def _call_claude(self, context: str, tool: Optional[Dict] = None) -> Dict:
+        """Call Claude API, forcing structured output through ``tool`` when given"""
         
         if not self.api_key:
             logger.warning("No Anthropic API key - using fallback insights")
@@ -140,6 +232,7 @@ Keep it concise, actionable, and investor-friendly.
         payload = {
             "model": self.model,
             "max_tokens": 1500,
+            "stream": True,
             "messages": [
                 {
                     "role": "user",
@@ -147,73 +240,138 @@ Keep it concise, actionable, and investor-friendly.
                 }
             ]
         }
+        if tool:
+            payload["tools"] = [tool]
+            payload["tool_choice"] = {"type": "tool", "name": tool["name"]}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
+            session, semaphore = await self._pool.get()
+            async with semaphore:
+                response = await request_with_retry(
+                    session,
+                    "POST",
                     self.api_url,
                     headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Extract text from response
-                        content = data.get('content', [])
-                        if content and len(content) > 0:
-                            text = content[0].get('text', '')
-                            
-                            # Try to parse as JSON
-                            try:
-                                # Find JSON in response
-                                json_start = text.find('{')
-                                json_end = text.rfind('}') + 1
-                                
-                                if json_start >= 0 and json_end > json_start:
-                                    json_str = text[json_start:json_end]
-                                    insights = json.loads(json_str)
-                                    return insights
-                                else:
-                                    # Fallback: structure the text
-                                    return {
-                                        "summary": text[:200],
-                                        "risks": ["Analysis provided in summary"],
-                                        "opportunities": ["See detailed analysis"],
-                                        "recommendations": [text],
-                                        "market_context": "AI-generated insights"
-                                    }
-                            except json.JSONDecodeError:
-                                logger.error("Failed to parse Claude response as JSON")
-                                return self._parse_fallback_response()
-                    else:
+                    data=orjson.dumps(payload),
+                    timeout=CLAUDE_TIMEOUT
+                )
+                async with response:
+                    if response.status != 200:
                         logger.error(f"Claude API error: {response.status}")
                         return self._parse_fallback_response()
-                        
+                    
+                    text, tool_input = await self._read_stream(response)
+                    
         except Exception as e:
             logger.error(f"Claude API call failed: {str(e)}")
             return self._parse_fallback_response()
+        
+        # Structured tool input is already the insights object
+        if tool_input:
+            try:
+                return orjson.loads(tool_input)
+            except orjson.JSONDecodeError:
+                logger.error("Failed to parse Claude tool input as JSON")
+                return self._parse_fallback_response()
+        
+        if not text:
+            return self._parse_fallback_response()
+        
+        # Try to parse as JSON
+        try:
+            # Find JSON in response
+            json_start = text.find('{')
+            json_end = text.rfind('}') + 1
+            
+            if json_start >= 0 and json_end > json_start:
+                json_str = text[json_start:json_end]
+                insights = orjson.loads(json_str)
+                return insights
+            else:
+                # Fallback: structure the text
+                return {
+                    "summary": text[:200],
+                    "risks": ["Analysis provided in summary"],
+                    "opportunities": ["See detailed analysis"],
+                    "recommendations": [text],
+                    "market_context": "AI-generated insights"
+                }
+        except orjson.JSONDecodeError:
+            logger.error("Failed to parse Claude response as JSON")
+            return self._parse_fallback_response()
+    
+    async def _read_stream(self, response: aiohttp.ClientResponse) -> Tuple[str, str]:
+        """
+        Accumulate text and tool-input deltas from a streamed Messages API response
+        
+        Stops collecting once the tool input block is complete, or, for plain
+        text replies, once the first top-level JSON object in the text is
+        closed, so trailing output is skipped. The stream itself is always
+        read to the end, since aiohttp closes connections released with an
+        unread body instead of returning them to the pool.
+        
+        Returns:
+            Tuple of (text, tool input JSON string)
+        """
+        text_parts = []
+        tool_parts = []
+        tool_done = False
+        text_done = False
+        depth = 0
+        in_string = False
+        escaped = False
+        
+        async for raw_line in response.content:
+            line = raw_line.strip()
+            if not line.startswith(b"data:"):
+                continue
+            
+            event = orjson.loads(line[5:])
+            event_type = event.get("type")
+            if event_type == "content_block_stop" and tool_parts:
+                tool_done = True
+                continue
+            if event_type != "content_block_delta" or tool_done:
+                continue
+            
+            delta = event.get("delta", {})
+            if delta.get("type") == "input_json_delta":
+                tool_parts.append(delta.get("partial_json", ""))
+                continue
+            
+            if text_done:
+                continue
+            chunk = delta.get("text", "")
+            
+            # Track brace depth outside of JSON strings
+            for index, char in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"' and depth > 0:
+                    in_string = True
+                elif char == "{":
+                    depth += 1
+                elif char == "}" and depth > 0:
+                    depth -= 1
+                    if depth == 0:
+                        # Keep the text up to and including this brace
+                        chunk = chunk[:index + 1]
+                        text_done = True
+                        break
+            text_parts.append(chunk)
+        
+        if text_done:
+            return "".join(text_parts), ""
+        return "".join(text_parts), "".join(tool_parts)
     
     def _parse_fallback_response(self) -> Dict:
         """Generate structured fallback insights"""
-        return {
-            "summary": "Portfolio analysis completed using risk metrics and market data. Review detailed breakdown below.",
-            "risks": [
-                "Monitor portfolio concentration levels",
-                "Track liquidity conditions in DeFi protocols",
-                "Stay aware of market volatility"
-            ],
-            "opportunities": [
-                "Consider diversification across L2 ecosystems",
-                "Explore yield optimization strategies"
-            ],
-            "recommendations": [
-                "Review top holdings allocation",
-                "Monitor social sentiment for tokens held",
-                "Set up automated risk alerts",
-                "Rebalance if concentration exceeds 40%"
-            ],
-            "market_context": "Analysis based on available on-chain and social data"
-        }
+        return FALLBACK_INSIGHTS
     
     def _get_fallback_insights(
         self,
@@ -223,12 +381,8 @@ Keep it concise, actionable, and investor-friendly.
         """Fallback insights when AI fails"""
         return {
             "wallet_address": wallet_address,
-            "insights": self._parse_fallback_response(),
-            "data_sources": {
-                "risk_analysis": True,
-                "social_sentiment": False,
-                "macro_conditions": False
-            },
+            "insights": FALLBACK_INSIGHTS,
+            "data_sources": FALLBACK_DATA_SOURCES,
             "note": "Generated using rule-based analysis (AI service unavailable)"
         }
     
@@ -251,15 +405,18 @@ Keep it concise, actionable, and investor-friendly.
             }
         
         # Build comparison context
-        context = "Compare these DeFi portfolios and provide insights:\n\n"
+        parts = ["Compare these DeFi portfolios and provide insights:\n\n"]
         
         for i, portfolio in enumerate(portfolios, 1):
-            context += f"Portfolio {i}:\n"
-            context += f"  Risk Score: {portfolio.get('risk_score', 'N/A')}/10\n"
-            context += f"  Risk Level: {portfolio.get('risk_level', 'N/A')}\n"
-            context += f"  Total Value: ${portfolio.get('total_value_usd', 0):,.0f}\n\n"
+            parts.append(
+                f"Portfolio {i}:\n"
+                f"  Risk Score: {portfolio.get('risk_score', 'N/A')}/10\n"
+                f"  Risk Level: {portfolio.get('risk_level', 'N/A')}\n"
+                f"  Total Value: ${portfolio.get('total_value_usd', 0):,.0f}\n\n"
+            )
         
-        context += "Provide: 1) Relative risk ranking, 2) Diversification comparison, 3) Best practices from top performer"
+        parts.append("Provide: 1) Relative risk ranking, 2) Diversification comparison, 3) Best practices from top performer")
+        context = "".join(parts)
         
         # Generate insights
         insights = await self._call_claude(context)
@@ -268,3 +425,14 @@ Keep it concise, actionable, and investor-friendly.
             "portfolios_compared": len(portfolios),
             "comparison_insights": insights
         }
+
+
+# Singleton instance
+_ai_engine = None
+
+def get_ai_engine() -> AIInsightsEngine:
+    """Get singleton AI insights engine instance"""
+    global _ai_engine
+    if _ai_engine is None:
+        _ai_engine = AIInsightsEngine()
+    return _ai_engine
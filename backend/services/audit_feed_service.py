@@ -9,9 +9,82 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 
+from utils.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 
+# Protocol audit database (will be enhanced with real APIs)
+_KNOWN_AUDITS = {
+    "mantle": {
+        "auditors": ["CertiK", "Trail of Bits"],
+        "audit_date": "2024-01-15",
+        "score": 95,
+        "critical_issues": 0,
+        "high_issues": 0,
+        "medium_issues": 2,
+        "low_issues": 5,
+        "audit_url": "https://mantle.xyz/audits",
+        "last_updated": "2024-01-15"
+    },
+    "meth": {
+        "auditors": ["CertiK", "OpenZeppelin"],
+        "audit_date": "2024-02-10",
+        "score": 92,
+        "critical_issues": 0,
+        "high_issues": 1,
+        "medium_issues": 3,
+        "low_issues": 4,
+        "audit_url": "https://mantle.xyz/meth-audit",
+        "last_updated": "2024-02-10"
+    },
+    "merchantmoe": {
+        "auditors": ["Peckshield", "Certik"],
+        "audit_date": "2023-12-20",
+        "score": 88,
+        "critical_issues": 0,
+        "high_issues": 2,
+        "medium_issues": 4,
+        "low_issues": 6,
+        "audit_url": "https://merchantmoe.com/audits",
+        "last_updated": "2023-12-20"
+    },
+    "fusionx": {
+        "auditors": ["Peckshield"],
+        "audit_date": "2024-03-01",
+        "score": 90,
+        "critical_issues": 0,
+        "high_issues": 1,
+        "medium_issues": 2,
+        "low_issues": 3,
+        "audit_url": "https://fusionx.finance/audits",
+        "last_updated": "2024-03-01"
+    },
+    "aave": {
+        "auditors": ["Trail of Bits", "OpenZeppelin", "Sigma Prime"],
+        "audit_date": "2023-11-30",
+        "score": 98,
+        "critical_issues": 0,
+        "high_issues": 0,
+        "medium_issues": 1,
+        "low_issues": 2,
+        "audit_url": "https://docs.aave.com/security",
+        "last_updated": "2023-11-30"
+    },
+    "uniswap": {
+        "auditors": ["Trail of Bits", "Consensys Diligence"],
+        "audit_date": "2024-01-05",
+        "score": 96,
+        "critical_issues": 0,
+        "high_issues": 0,
+        "medium_issues": 2,
+        "low_issues": 3,
+        "audit_url": "https://docs.uniswap.org/security",
+        "last_updated": "2024-01-05"
+    }
+}
+
+
 class AuditFeedService:
     """Fetch and process security audit data"""
     
@@ -27,75 +100,20 @@ class AuditFeedService:
             "immunefi": "https://immunefi.com/api"
         }
         
-        # Protocol audit database (will be enhanced with real APIs)
-        self.known_audits = {
-            "mantle": {
-                "auditors": ["CertiK", "Trail of Bits"],
-                "audit_date": "2024-01-15",
-                "score": 95,
-                "critical_issues": 0,
-                "high_issues": 0,
-                "medium_issues": 2,
-                "low_issues": 5,
-                "audit_url": "https://mantle.xyz/audits",
-                "last_updated": "2024-01-15"
-            },
-            "meth": {
-                "auditors": ["CertiK", "OpenZeppelin"],
-                "audit_date": "2024-02-10",
-                "score": 92,
-                "critical_issues": 0,
-                "high_issues": 1,
-                "medium_issues": 3,
-                "low_issues": 4,
-                "audit_url": "https://mantle.xyz/meth-audit",
-                "last_updated": "2024-02-10"
-            },
-            "merchantmoe": {
-                "auditors": ["Peckshield", "Certik"],
-                "audit_date": "2023-12-20",
-                "score": 88,
-                "critical_issues": 0,
-                "high_issues": 2,
-                "medium_issues": 4,
-                "low_issues": 6,
-                "audit_url": "https://merchantmoe.com/audits",
-                "last_updated": "2023-12-20"
-            },
-            "fusionx": {
-                "auditors": ["Peckshield"],
-                "audit_date": "2024-03-01",
-                "score": 90,
-                "critical_issues": 0,
-                "high_issues": 1,
-                "medium_issues": 2,
-                "low_issues": 3,
-                "audit_url": "https://fusionx.finance/audits",
-                "last_updated": "2024-03-01"
-            },
-            "aave": {
-                "auditors": ["Trail of Bits", "OpenZeppelin", "Sigma Prime"],
-                "audit_date": "2023-11-30",
-                "score": 98,
-                "critical_issues": 0,
-                "high_issues": 0,
-                "medium_issues": 1,
-                "low_issues": 2,
-                "audit_url": "https://docs.aave.com/security",
-                "last_updated": "2023-11-30"
-            },
-            "uniswap": {
-                "auditors": ["Trail of Bits", "Consensys Diligence"],
-                "audit_date": "2024-01-05",
-                "score": 96,
-                "critical_issues": 0,
-                "high_issues": 0,
-                "medium_issues": 2,
-                "low_issues": 3,
-                "audit_url": "https://docs.uniswap.org/security",
-                "last_updated": "2024-01-05"
-            }
+        # Known audits keyed by lowercase protocol name
+        self.known_audits: Dict[str, Dict] = {
+            name.lower(): dict(audit, auditors=list(audit["auditors"]))
+            for name, audit in _KNOWN_AUDITS.items()
+        }
+        
+        # The database is static, so score it once
+        self._known_risk_levels: Dict[str, str] = {
+            protocol_key: self._calculate_audit_risk(audit)
+            for protocol_key, audit in self.known_audits.items()
         }
+        
+        # API lookups (including misses) keyed by lowercase protocol name
+        self._api_audit_cache = TTLCache(ttl=300, maxsize=512)
     
     async def get_protocol_audit(self, protocol_name: str) -> Dict:
         """
@@ -107,22 +125,63 @@ class AuditFeedService:
         Returns:
             Audit information
         """
-        protocol_lower = protocol_name.lower()
+        protocol_key = protocol_name.strip().lower()
         
         # Check known audits first
-        if protocol_lower in self.known_audits:
-            audit_data = self.known_audits[protocol_lower]
-            return {
-                "protocol": protocol_name,
-                "audit_status": "audited",
-                "audit_data": audit_data,
-                "risk_level": self._calculate_audit_risk(audit_data),
-                "data_source": "database"
-            }
+        if protocol_key in self.known_audits:
+            return self._render_known_audit(protocol_name, protocol_key)
+        
+        return await self._fetch_and_build(protocol_name, protocol_key)
+    
+    async def get_multiple_audits(self, protocols: List[str]) -> Dict[str, Dict]:
+        """
+        Get audits for multiple protocols
+        
+        Args:
+            protocols: List of protocol names
+            
+        Returns:
+            Dictionary of audit information
+        """
+        results = {}
+        unknown = []
+        
+        # Known protocols resolve synchronously, only the rest need the APIs
+        for protocol in protocols:
+            protocol_key = protocol.strip().lower()
+            if protocol_key in self.known_audits:
+                results[protocol] = self._render_known_audit(protocol, protocol_key)
+            else:
+                unknown.append((protocol, protocol_key))
+        
+        if unknown:
+            fetched = await asyncio.gather(
+                *(self._fetch_and_build(protocol, protocol_key) for protocol, protocol_key in unknown)
+            )
+            for (protocol, _), result in zip(unknown, fetched):
+                results[protocol] = result
         
+        # Preserve the caller's protocol order
+        return {protocol: results[protocol] for protocol in protocols}
+    
+    def _render_known_audit(self, protocol_name: str, protocol_key: str) -> Dict:
+        """Build the audit response for a protocol in the known audit database"""
+        return {
+            "protocol": protocol_name,
+            "audit_status": "audited",
+            "audit_data": self.known_audits[protocol_key],
+            "risk_level": self._known_risk_levels[protocol_key],
+            "data_source": "database"
+        }
+    
+    async def _fetch_and_build(self, protocol_name: str, protocol_key: str) -> Dict:
+        """Build the audit response for a protocol outside the known audit database"""
         # Try fetching from APIs
         try:
-            audit_data = await self._fetch_from_apis(protocol_name)
+            hit, audit_data = self._api_audit_cache.lookup(protocol_key)
+            if not hit:
+                audit_data = await self._fetch_from_apis(protocol_name)
+                self._api_audit_cache.set(protocol_key, audit_data)
             if audit_data:
                 return {
                     "protocol": protocol_name,
@@ -144,24 +203,6 @@ class AuditFeedService:
             "warning": "No audit information available"
         }
     
-    async def get_multiple_audits(self, protocols: List[str]) -> Dict[str, Dict]:
-        """
-        Get audits for multiple protocols
-        
-        Args:
-            protocols: List of protocol names
-            
-        Returns:
-            Dictionary of audit information
-        """
-        tasks = [self.get_protocol_audit(protocol) for protocol in protocols]
-        results = await asyncio.gather(*tasks)
-        
-        return {
-            protocol: result 
-            for protocol, result in zip(protocols, results)
-        }
-    
     def _calculate_audit_risk(self, audit_data: Dict) -> str:
         """
         Calculate risk level based on audit findings
@@ -1,36 +1,64 @@
-import asyncio
+import logging
 import aiohttp
+import orjson
 from typing import Dict, Any
 
+from utils.http_retry import request_with_retry
+from utils.session_pool import SessionPool
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Cap on in-flight Dexscreener requests per event loop
+DEX_MAX_CONCURRENCY = 32
+
 
 class ExternalService:
     def __init__(self):
-        pass
+        self._pool = SessionPool(DEX_MAX_CONCURRENCY)
+        # Recent Dexscreener prices keyed by lowercase token address
+        self._price_cache = TTLCache(ttl=30, maxsize=1024)
+
+    async def close(self) -> None:
+        """Close the running loop's pooled session"""
+        await self._pool.close()
 
 
     async def dex_screener_price_data(self,token_address:str)->Dict[str,Any]|None:
         if not isinstance(token_address,str):
             return 
         
-        async with aiohttp.ClientSession() as session:
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-            async with session.get(url) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if not result:
-                        return
-                    
-                    pair_data = result.get('pairs',[])
-                    if not pair_data:
-                        return
-                    
-                    pairs_data_info = pair_data[0]
-                    price = pairs_data_info.get('priceUsd',0)
-                    price_change_1hr = pairs_data_info.get('priceChange').get('h1')
-
-                    price_info:Dict[str,Any] = {
-                        'price':price,
-                        'price_change_1hr':price_change_1hr
-                    }
-                    return price_info
+        cache_key = token_address.strip().lower()
+        cached = self._price_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        session, semaphore = await self._pool.get()
+        url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
+        async with semaphore:
+            response = await request_with_retry(
+                session, "GET", url, timeout=aiohttp.ClientTimeout(total=5)
+            )
+            async with response:
+                if response.status != 200:
+                    logger.warning(f"Dexscreener error {response.status} for {token_address}")
+                    return
+                
+                result = orjson.loads(await response.read())
+                if not result:
+                    return
+                
+                pair_data = result.get('pairs',[])
+                if not pair_data:
+                    return
+                
+                pairs_data_info = pair_data[0]
+                price = pairs_data_info.get('priceUsd',0)
+                price_change_1hr = (pairs_data_info.get('priceChange') or {}).get('h1')
 
+                price_info:Dict[str,Any] = {
+                    'price':price,
+                    'price_change_1hr':price_change_1hr
+                }
+                self._price_cache.set(cache_key, price_info)
+                return price_info
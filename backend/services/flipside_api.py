@@ -3,84 +3,227 @@
 This implements a small helper to submit SQL queries and poll for results.
 See: https://developer.flipsidecrypto.com/ for production details.
 
-Note: This is a prototype with simple polling and no advanced retry/backoff.
+The client is async and shares one pooled httpx.AsyncClient per event loop;
+blocking wrappers with the original names are kept for scripts.
 """
 from __future__ import annotations
+import asyncio
+import logging
 import os
+import random
 import time
-import requests
-from typing import Dict, Any, Optional
+import weakref
+import httpx
+import orjson
+from typing import Dict, Any, Optional, Tuple
+
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 FLIPSIDE_API_KEY = os.getenv("FLIPSIDE_API_KEY")
 FLIPSIDE_API_URL = os.getenv("FLIPSIDE_API_URL", "https://api.flipsidecrypto.com")
 
+POLL_TIMEOUT_SECONDS = 60
+POLL_INITIAL_DELAY = 0.1
+POLL_BACKOFF = 1.5
+POLL_MAX_DELAY = 5.0
+
+# Connection-level failures are retried by the transport for every method;
+# status-based retries only apply to idempotent GETs
+CONNECT_RETRIES = 3
+GET_RETRIES = 3
+GET_BACKOFF = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Clients are bound to the loop that opened them, so each loop gets its own;
+# entries go away with their loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+# Identical SQL submitted while a run is in flight shares that run, and
+# finished results are reused for a short while; keyed by (api key, ttl, sql)
+RESULT_CACHE_TTL = 60
+RESULT_CACHE_SIZE = 128
+_result_cache = TTLCache(ttl=RESULT_CACHE_TTL, maxsize=RESULT_CACHE_SIZE)
+_inflight: Dict[Tuple[Optional[str], int, str], asyncio.Task] = {}
+
+
 class FlipsideError(Exception):
     pass
 
 
-def submit_query(sql: str, ttl_minutes: int = 10, api_key: Optional[str] = None) -> Dict[str, Any]:
-    """Submit a SQL query to Flipside and return the query metadata (including query_id).
-    Raises FlipsideError on failure.
-    """
+def _get_client() -> httpx.AsyncClient:
+    """Return the running loop's shared client, opening it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=CONNECT_RETRIES,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+        client = _clients[loop] = httpx.AsyncClient(transport=transport, timeout=30)
+    return client
+
+
+async def close() -> None:
+    """Close the running loop's client, if one is open; other loops' clients are untouched."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _retry_after(resp: httpx.Response) -> Optional[float]:
+    """Return the server's Retry-After hint in seconds, if it sent a numeric one."""
+    value = resp.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+async def _get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """GET with backoff on retryable statuses; the last response is returned as-is."""
+    for attempt in range(GET_RETRIES + 1):
+        resp = await client.get(url, **kwargs)
+        if resp.status_code not in RETRY_STATUSES or attempt == GET_RETRIES:
+            return resp
+        hint = _retry_after(resp)
+        await asyncio.sleep(hint if hint is not None else GET_BACKOFF * 2 ** attempt)
+    return resp
+
+
+def _headers(api_key: Optional[str]) -> Dict[str, str]:
     key = api_key or FLIPSIDE_API_KEY
     if not key:
         raise FlipsideError("FLIPSIDE_API_KEY is not set")
+    return {"Authorization": f"Bearer {key}", "Content-Type": "application/json"}
+
 
+async def submit_query_async(sql: str, ttl_minutes: int = 10, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Submit a SQL query to Flipside and return the query metadata (including query_id).
+    Raises FlipsideError on failure.
+    """
+    headers = _headers(api_key)
     url = f"{FLIPSIDE_API_URL}/api/v2/queries"
-    headers = {"Authorization": f"Bearer {key}", "Content-Type": "application/json"}
     body = {"sql": sql, "ttlMinutes": ttl_minutes}
-    resp = requests.post(url, json=body, headers=headers, timeout=30)
+    resp = await _get_client().post(url, json=body, headers=headers)
     try:
         resp.raise_for_status()
     except Exception as e:
         raise FlipsideError(f"submit_query failed: {e} - {resp.text}")
-    return resp.json()
+    return orjson.loads(resp.content)
 
 
-def fetch_query_result(query_id: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+async def fetch_query_result_async(query_id: str, api_key: Optional[str] = None) -> Dict[str, Any]:
     """Poll the flipside query result endpoint until complete or until timeout.
     Returns the final result JSON (may contain `results` key with rows).
     """
-    key = api_key or FLIPSIDE_API_KEY
-    if not key:
-        raise FlipsideError("FLIPSIDE_API_KEY is not set")
-
+    headers = _headers(api_key)
     status_url = f"{FLIPSIDE_API_URL}/api/v2/queries/{query_id}"
     result_url = f"{FLIPSIDE_API_URL}/api/v2/queries/{query_id}/results"
-    headers = {"Authorization": f"Bearer {key}", "Content-Type": "application/json"}
+    client = _get_client()
 
-    # small polling loop
-    timeout_seconds = 60
-    start = time.time()
+    # Short queries finish in well under a second, so start polling quickly
+    # and back off towards POLL_MAX_DELAY for long-running ones
+    deadline = time.monotonic() + POLL_TIMEOUT_SECONDS
+    delay = POLL_INITIAL_DELAY
+    attempt = 0
     while True:
-        resp = requests.get(status_url, headers=headers, timeout=15)
+        attempt += 1
+        resp = await _get(client, status_url, headers=headers, timeout=15)
         try:
             resp.raise_for_status()
         except Exception as e:
             raise FlipsideError(f"fetch status failed: {e} - {resp.text}")
-        status = resp.json().get("status")
+        meta = orjson.loads(resp.content)
+        status = meta.get("status")
         if status == "finished":
+            logger.debug("Flipside query %s finished after %d polls", query_id, attempt)
             # fetch results
-            r = requests.get(result_url, headers=headers, timeout=30)
+            r = await _get(client, result_url, headers=headers)
             try:
                 r.raise_for_status()
             except Exception as e:
                 raise FlipsideError(f"fetch result failed: {e} - {r.text}")
-            return r.json()
+            return orjson.loads(r.content)
         if status == "failed":
-            raise FlipsideError(f"Query {query_id} failed: {resp.json()}")
-        if time.time() - start > timeout_seconds:
-            raise FlipsideError("Timeout waiting for Flipside query result")
-        time.sleep(1)
+            raise FlipsideError(f"Query {query_id} failed: {meta}")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise FlipsideError(f"Timeout waiting for Flipside query result after {attempt} polls")
 
+        # Honor the server's hint when given; otherwise jitter within the
+        # backoff window so concurrent queries don't poll in lockstep
+        hint = _retry_after(resp)
+        wait = hint if hint is not None else delay * (0.5 + random.random() / 2)
+        await asyncio.sleep(min(wait, remaining))
+        delay = min(POLL_MAX_DELAY, delay * POLL_BACKOFF)
 
-def run_sql_and_get_results(sql: str, ttl_minutes: int = 10, api_key: Optional[str] = None) -> Dict[str, Any]:
-    meta = submit_query(sql, ttl_minutes=ttl_minutes, api_key=api_key)
+
+async def _run_sql(sql: str, ttl_minutes: int, api_key: Optional[str]) -> Dict[str, Any]:
+    meta = await submit_query_async(sql, ttl_minutes=ttl_minutes, api_key=api_key)
     query_id = meta.get("queryId") or meta.get("id") or meta.get("query_id")
     if not query_id:
         # Try common keys, otherwise return meta
         raise FlipsideError(f"Could not extract query_id from response: {meta}")
-    return fetch_query_result(query_id, api_key=api_key)
+    return await fetch_query_result_async(query_id, api_key=api_key)
+
+
+async def run_sql_and_get_results_async(sql: str, ttl_minutes: int = 10, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Submit a SQL query and wait for its results.
+    Concurrent calls with the same SQL share one submission, and results are
+    reused for RESULT_CACHE_TTL seconds; the returned dict is shared, so
+    callers must not mutate it.
+    """
+    key = (api_key or FLIPSIDE_API_KEY, ttl_minutes, sql)
+    cached = _result_cache.get(key)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(_run_sql(sql, ttl_minutes, api_key))
+        _inflight[key] = task
+
+        def _settle(done: asyncio.Task) -> None:
+            if _inflight.get(key) is done:
+                del _inflight[key]
+            if not done.cancelled() and done.exception() is None:
+                _result_cache.set(key, done.result())
+
+        task.add_done_callback(_settle)
+
+    # Shielded so one caller being cancelled doesn't cancel the shared run
+    return await asyncio.shield(task)
+
+
+def _run_sync(coro) -> Dict[str, Any]:
+    """Run a coroutine on a fresh event loop and close the client it opened."""
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await close()
+    return asyncio.run(runner())
+
+
+def submit_query(sql: str, ttl_minutes: int = 10, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Blocking wrapper around submit_query_async."""
+    return _run_sync(submit_query_async(sql, ttl_minutes=ttl_minutes, api_key=api_key))
+
+
+def fetch_query_result(query_id: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Blocking wrapper around fetch_query_result_async."""
+    return _run_sync(fetch_query_result_async(query_id, api_key=api_key))
+
+
+def run_sql_and_get_results(sql: str, ttl_minutes: int = 10, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Blocking wrapper around run_sql_and_get_results_async."""
+    return _run_sync(run_sql_and_get_results_async(sql, ttl_minutes=ttl_minutes, api_key=api_key))
 
 
 if __name__ == "__main__":
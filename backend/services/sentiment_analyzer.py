@@ -2,9 +2,18 @@
 Sentiment Analysis Service
 Analyzes sentiment from social media data
 """
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import re
-from collections import Counter
+
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:  # no wheel for this platform; fall back to a compiled regex
+    ahocorasick = None
+
+SCORE_CACHE_SIZE = 4096
+NO_SIGNAL = (0.0, 0, 0)
 
 
 class SentimentAnalyzer:
@@ -12,19 +21,84 @@ class SentimentAnalyzer:
     
     def __init__(self):
         # Positive and negative keywords
-        self.positive_keywords = {
+        self.positive_keywords = frozenset({
             'bullish', 'moon', 'buy', 'long', 'pump', 'gains', 'profit',
             'green', 'up', 'growth', 'strong', 'solid', 'good', 'great',
             'excellent', 'amazing', 'fantastic', 'love', 'best', '🚀', '📈',
             '💎', '🔥', '✅', '💪', 'gem', 'potential', 'promising'
-        }
+        })
         
-        self.negative_keywords = {
+        self.negative_keywords = frozenset({
             'bearish', 'dump', 'sell', 'short', 'crash', 'loss', 'red',
             'down', 'weak', 'bad', 'terrible', 'awful', 'worst', 'hate',
             'scam', 'rug', '📉', '⚠', '❌', '💩', 'avoid', 'warning',
             'risky', 'danger', 'failing', 'dead'
-        }
+        })
+        
+        self._keyword_signs = {keyword: (1, keyword) for keyword in self.positive_keywords}
+        self._keyword_signs.update((keyword, (-1, keyword)) for keyword in self.negative_keywords)
+        
+        # One automaton (or one regex) for both polarities, so each text is scanned once
+        self.automaton = None
+        self._keyword_re = None
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for keyword, value in self._keyword_signs.items():
+                self.automaton.add_word(keyword, value)
+            self.automaton.make_automaton()
+        else:
+            # The lookahead matches at every offset, so overlapping keywords are
+            # all found like the automaton does; longest-first avoids shadowing
+            alternation = "|".join(
+                re.escape(keyword) for keyword in sorted(self._keyword_signs, key=len, reverse=True)
+            )
+            self._keyword_re = re.compile(f"(?=({alternation}))")
+        
+        # Every match starts with one of these, so texts containing none of
+        # them (URL-only reposts, numbers, unrelated emoji) can skip the scan
+        self._keyword_first_chars = frozenset(keyword[0] for keyword in self._keyword_signs)
+        
+        # Reposts and duplicates are common in social feeds, so scores are
+        # memoized by raw text and the cache is dropped wholesale when full
+        self._score_cache: Dict[str, Tuple[float, int, int]] = {}
+    
+    def _score(self, text_lower: str) -> Tuple[float, int, int]:
+        """
+        Score already-lowercased text without building a result dict
+        
+        Returns:
+            Tuple of (score, positive_count, negative_count)
+        """
+        # Count distinct positive and negative keywords present in the text
+        if self.automaton is not None:
+            matched = {match for _, match in self.automaton.iter(text_lower)}
+        else:
+            signs = self._keyword_signs
+            matched = {signs[keyword] for keyword in self._keyword_re.findall(text_lower)}
+        positive_count = sum(1 for sign, _ in matched if sign > 0)
+        negative_count = len(matched) - positive_count
+        
+        # Calculate sentiment score (-1 to 1)
+        total = positive_count + negative_count
+        if total == 0:
+            return NO_SIGNAL
+        return (positive_count - negative_count) / total, positive_count, negative_count
+    
+    def _score_text(self, text: str) -> Tuple[float, int, int]:
+        """Memoized _score for raw (not yet lowercased) text"""
+        cached = self._score_cache.get(text)
+        if cached is not None:
+            return cached
+        
+        text_lower = text.lower()
+        if self._keyword_first_chars.isdisjoint(text_lower):
+            # Not cached, so signal-free posts don't evict real ones
+            return NO_SIGNAL
+        
+        if len(self._score_cache) >= SCORE_CACHE_SIZE:
+            self._score_cache.clear()
+        result = self._score_cache[text] = self._score(text_lower)
+        return result
     
     def analyze_text(self, text: str) -> Dict:
         """
@@ -36,18 +110,7 @@ class SentimentAnalyzer:
         Returns:
             Sentiment analysis result
         """
-        text_lower = text.lower()
-        
-        # Count positive and negative keywords
-        positive_count = sum(1 for word in self.positive_keywords if word in text_lower)
-        negative_count = sum(1 for word in self.negative_keywords if word in text_lower)
-        
-        # Calculate sentiment score (-1 to 1)
-        total = positive_count + negative_count
-        if total == 0:
-            score = 0.0
-        else:
-            score = (positive_count - negative_count) / total
+        score, positive_count, negative_count = self._score_text(text)
         
         # Classify sentiment
         if score > 0.2:
@@ -74,6 +137,13 @@ class SentimentAnalyzer:
         Returns:
             Aggregated sentiment analysis
         """
+        return self._analyze_batch(posts)[0]
+    
+    def _analyze_batch(self, posts: List[Dict]) -> Tuple[Dict, float]:
+        """
+        analyze_batch that also returns the unrounded overall score, so
+        callers can weight it without compounding the rounding error
+        """
         if not posts:
             return {
                 "overall_score": 0.0,
@@ -84,20 +154,21 @@ class SentimentAnalyzer:
                     "neutral": 0,
                     "negative": 0
                 }
-            }
+            }, 0.0
         
-        sentiments = []
-        sentiment_counts = Counter()
+        # Texts are pulled out once, then scored into an array and classified
+        # in one vectorized pass
+        texts = [text for text in (post.get("text") or post.get("title") for post in posts) if text]
+        analyzed = len(texts)
+        score_text = self._score_text
+        scores = np.fromiter((score_text(text)[0] for text in texts), dtype=np.float64, count=analyzed)
         
-        for post in posts:
-            text = post.get("text", "") or post.get("title", "")
-            if text:
-                result = self.analyze_text(text)
-                sentiments.append(result["score"])
-                sentiment_counts[result["sentiment"]] += 1
+        positive_count = int(np.count_nonzero(scores > 0.2))
+        negative_count = int(np.count_nonzero(scores < -0.2))
+        neutral_count = analyzed - positive_count - negative_count
         
         # Calculate overall metrics
-        overall_score = sum(sentiments) / len(sentiments) if sentiments else 0.0
+        overall_score = float(scores.mean()) if analyzed else 0.0
         
         if overall_score > 0.2:
             overall_sentiment = "positive"
@@ -106,19 +177,20 @@ class SentimentAnalyzer:
         else:
             overall_sentiment = "neutral"
         
-        return {
+        result = {
             "overall_score": round(overall_score, 3),
             "overall_sentiment": overall_sentiment,
             "total_posts": len(posts),
             "sentiment_distribution": {
-                "positive": sentiment_counts.get("positive", 0),
-                "neutral": sentiment_counts.get("neutral", 0),
-                "negative": sentiment_counts.get("negative", 0)
+                "positive": positive_count,
+                "neutral": neutral_count,
+                "negative": negative_count
             },
-            "positive_percentage": round(sentiment_counts.get("positive", 0) / len(posts) * 100, 1),
-            "neutral_percentage": round(sentiment_counts.get("neutral", 0) / len(posts) * 100, 1),
-            "negative_percentage": round(sentiment_counts.get("negative", 0) / len(posts) * 100, 1)
+            "positive_percentage": round(positive_count / len(posts) * 100, 1),
+            "neutral_percentage": round(neutral_count / len(posts) * 100, 1),
+            "negative_percentage": round(negative_count / len(posts) * 100, 1)
         }
+        return result, overall_score
     
     def analyze_by_platform(self, all_data: Dict[str, List[Dict]]) -> Dict:
         """
@@ -132,18 +204,16 @@ class SentimentAnalyzer:
         """
         results = {}
         
+        # Totals are accumulated as each platform is scored, so the weighted
+        # overall needs no second pass over the results
+        total_posts = 0
+        weighted_sum = 0.0
         for platform, posts in all_data.items():
-            results[platform] = self.analyze_batch(posts)
-        
-        # Calculate weighted overall sentiment
-        total_posts = sum(r["total_posts"] for r in results.values())
-        if total_posts > 0:
-            weighted_score = sum(
-                r["overall_score"] * r["total_posts"]
-                for r in results.values()
-            ) / total_posts
-        else:
-            weighted_score = 0.0
+            results[platform], score = self._analyze_batch(posts)
+            total_posts += len(posts)
+            weighted_sum += score * len(posts)
+        
+        weighted_score = weighted_sum / total_posts if total_posts > 0 else 0.0
         
         if weighted_score > 0.2:
             overall_sentiment = "positive"
@@ -158,3 +228,8 @@ class SentimentAnalyzer:
             "overall_sentiment": overall_sentiment,
             "total_posts_analyzed": total_posts
         }
+
+
+# Shared instance, so the automaton is built and the score cache warmed
+# once per process rather than once per agent
+default_analyzer = SentimentAnalyzer()
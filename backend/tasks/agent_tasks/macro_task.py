@@ -3,9 +3,13 @@ Macro Market Analysis Celery Task - With Alert Triggering
 """
 from multiprocessing import Value
 from core import celery_app
-import asyncio
+from tasks._loop import run_coro
+import logging
 # REMOVE THIS LINE: from services.alert_manager import AlertManager
 
+logger = logging.getLogger(__name__)
+
+
 @celery_app.task(bind=True, name="macro_analysis")
 def macro_task( wallet_address: str = None):
     """
@@ -18,7 +22,7 @@ def macro_task( wallet_address: str = None):
         #     meta={'status': 'Fetching macro indicators...', 'progress': 0}
         # )
         
-        print(f'Running macro analysis On: {wallet_address or "all"}')
+        logger.info("Running macro analysis On: %s", wallet_address or "all")
         
         # Lazy import to avoid circular dependency
         # from services.alert_manager import AlertManager
@@ -30,10 +34,6 @@ def macro_task( wallet_address: str = None):
         # alert_manager = AlertManager()
         pipeline = Pipeline()
 
-        # Run async analysis
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         # self.update_state(
         #     state='PROCESSING',
         #     meta={'status': 'Analyzing market correlations...', 'progress': 40}
@@ -44,10 +44,8 @@ def macro_task( wallet_address: str = None):
         import uuid
 
         # Run the agent to fetch yield opportunities (pipeline preferred)
-        user_portfolio_data = loop.run_until_complete(
-            pipeline.user_portfolio(wallet_address)
-        )
-        macro_result = loop.run_until_complete(macro_agent.yield_opportunity(user_portfolio_data))
+        user_portfolio_data = run_coro(pipeline.user_portfolio(wallet_address))
+        macro_result = run_coro(macro_agent.yield_opportunity(user_portfolio_data))
 
         # Create alerts for significant yield opportunities
         triggered_alerts = []
@@ -90,7 +88,7 @@ def macro_task( wallet_address: str = None):
                     except Exception:
                         # fallback: append to list
                         pass
-                    triggered_alerts.append(alert.dict())
+                    triggered_alerts.append(alert.model_dump(mode='json'))
         except Exception:
             # keep placeholder empty list if anything goes wrong
             triggered_alerts = []
@@ -100,9 +98,7 @@ def macro_task( wallet_address: str = None):
         #     meta={'status': 'Checking correlation alerts...', 'progress': 80}
         # )
         
-        loop.close()
-        
-        print(f'Triggered {len(triggered_alerts)} macro alerts')
+        logger.info("Triggered %d macro alerts", len(triggered_alerts))
         
         return {
             'status': 'completed',
@@ -115,7 +111,7 @@ def macro_task( wallet_address: str = None):
         }
     
     except Exception as e:
-        print(f'Macro analysis failed: {str(e)}')
+        logger.error("Macro analysis failed: %s", e)
         
         # self.update_state(
         #     state='FAILURE',
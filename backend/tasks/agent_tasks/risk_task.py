@@ -20,6 +20,7 @@ def risk_task(self, wallet_address: str, network: str = "mantle", market_correla
 
         # lazy import to avoidd circular dependency
         from services.alert_manager import AlertManager
+        from api.models.alerts import Alert
         
         # Initialize agents
         risk_agent = RiskAgent()
@@ -64,10 +65,10 @@ def risk_task(self, wallet_address: str, network: str = "mantle", market_correla
             'status': 'completed',
             'wallet_address': wallet_address,
             'network': network,
-            'risk_analysis': risk_score.dict(),
+            'risk_analysis': risk_score.model_dump(mode='json'),
             'market_condition': risk_score.market_condition,
             'alerts_triggered': len(triggered_alerts),
-            'alerts': [alert.to_dict() for alert in triggered_alerts],
+            'alerts': Alert.to_dicts(triggered_alerts),
             'agent': 'risk',
             'version': '2.0_with_alerts'
         }
@@ -2,9 +2,11 @@
 Social Sentiment Analysis Celery Task - With Alert Triggering
 """
 from core import celery_app
-import asyncio
+import logging
 # REMOVE THIS LINE: from services.alert_manager import AlertManager
 
+logger = logging.getLogger(__name__)
+
 
 @celery_app.task(bind=True, name="social_analysis")
 def social_task(self, token_symbol: str, platforms: list = None, alert_threshold: float = 0.7):
@@ -17,7 +19,7 @@ def social_task(self, token_symbol: str, platforms: list = None, alert_threshold
             meta={'status': 'Fetching social sentiment...', 'progress': 0}
         )
         
-        print(f'Running social sentiment analysis for: {token_symbol}')
+        logger.info("Running social sentiment analysis for: %s", token_symbol)
         
         # Lazy import to avoid circular dependency
         from services.alert_manager import AlertManager
@@ -31,10 +33,6 @@ def social_task(self, token_symbol: str, platforms: list = None, alert_threshold
         if platforms is None:
             platforms = ["twitter", "farcaster", "reddit"]
         
-        # Run async agent code
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         self.update_state(
             state='PROCESSING',
             meta={'status': 'Analyzing sentiment across platforms...', 'progress': 30}
@@ -56,10 +54,8 @@ def social_task(self, token_symbol: str, platforms: list = None, alert_threshold
         # Trigger alerts for extreme sentiment (placeholder)
         triggered_alerts = []
         
-        loop.close()
-        
-        print(f'Social analysis completed: {sentiment_result["overall_score"]}')
-        print(f'Triggered {len(triggered_alerts)} sentiment alerts')
+        logger.info("Social analysis completed: %s", sentiment_result["overall_score"])
+        logger.info("Triggered %d sentiment alerts", len(triggered_alerts))
         
         return {
             'status': 'completed',
@@ -73,7 +69,7 @@ def social_task(self, token_symbol: str, platforms: list = None, alert_threshold
         }
         
     except Exception as e:
-        print(f'Social analysis failed: {str(e)}')
+        logger.error("Social analysis failed: %s", e)
         
         self.update_state(
             state='FAILURE',
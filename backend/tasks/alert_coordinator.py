@@ -124,8 +124,11 @@ def process_smart_money(event: dict):
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
+    orchestrator = AlertOrchestrator()
     try:
-        result = loop.run_until_complete(AlertOrchestrator().process_event(event))
+        result = loop.run_until_complete(orchestrator.process_event(event))
         return result
     finally:
+        # Sessions are per loop, so close them before this loop goes away
+        loop.run_until_complete(orchestrator.close())
         loop.close()
@@ -0,0 +1,53 @@
+"""
+Retry helper for outbound aiohttp requests
+Retries transient failures with exponential backoff and jitter
+"""
+import asyncio
+import random
+from typing import FrozenSet
+
+import aiohttp
+
+RETRY_STATUSES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+
+async def request_with_retry(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    *,
+    attempts: int = 3,
+    start_timeout: float = 0.2,
+    retry_statuses: FrozenSet[int] = RETRY_STATUSES,
+    **kwargs
+) -> aiohttp.ClientResponse:
+    """
+    Send a request, retrying connection errors, timeouts and retryable statuses
+
+    Args:
+        session: Session to send the request with
+        method: HTTP method
+        url: Request URL
+        attempts: Total number of attempts
+        start_timeout: Base delay in seconds, doubled after each attempt
+        retry_statuses: Response statuses worth retrying
+        **kwargs: Passed through to session.request
+
+    Returns:
+        The response, to be used as `async with response:`. After the last
+        attempt a retryable status is returned as-is for the caller to handle.
+    """
+    for attempt in range(attempts):
+        is_last = attempt == attempts - 1
+        try:
+            response = await session.request(method, url, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if is_last:
+                raise
+        else:
+            if is_last or response.status not in retry_statuses:
+                return response
+            response.release()
+
+        # Jitter spreads concurrent retries out instead of piling them up
+        await asyncio.sleep(start_timeout * 2 ** attempt * (0.5 + random.random()))
@@ -0,0 +1,35 @@
+"""
+Per-event-loop pooled aiohttp sessions
+Sessions and semaphores are bound to the loop that created them, so each
+loop gets its own pair; callers must close() on a loop before discarding it
+"""
+import asyncio
+import weakref
+from typing import Tuple
+
+import aiohttp
+
+
+class SessionPool:
+    """Pooled aiohttp session plus a request-limiting semaphore per event loop"""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    async def get(self) -> Tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+        """Return the running loop's session and semaphore, recreated if closed"""
+        loop = asyncio.get_running_loop()
+        pool = self._sessions.get(loop)
+        if pool is None or pool[0].closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+            )
+            pool = self._sessions[loop] = (session, asyncio.Semaphore(self.max_concurrency))
+        return pool
+
+    async def close(self) -> None:
+        """Close the running loop's session; other loops' sessions are untouched"""
+        pool = self._sessions.pop(asyncio.get_running_loop(), None)
+        if pool is not None and not pool[0].closed:
+            await pool[0].close()
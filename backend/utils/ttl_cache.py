@@ -0,0 +1,48 @@
+"""
+Small in-memory cache with per-entry expiry
+Used to keep hot read-mostly lookups (prices, audits) off the network
+"""
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Dict-backed cache whose entries expire ttl seconds after being set"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del self._data[next(iter(self._data))]
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Optional[Any]]:
+        """Return (hit, value) so cached None results can be told apart from misses"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            return False, None
+        return True, value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)